@@ -0,0 +1,96 @@
+# sk_guardrails/client.py
+"""
+Thin asyncio client for the guard service in sk_guardrails.serve.
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Dict, Any
+
+from sk_guardrails.serve import DEFAULT_LIMIT, LineTooLong, read_line
+
+
+class GuardClient:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str = None,
+                 limit: int = DEFAULT_LIMIT):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        # Should match the server's limit; larger requests fail locally
+        self.limit = limit
+        self._reader = None
+        self._writer = None
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._read_task = None
+
+    async def connect(self):
+        if self.unix_path:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.unix_path, limit=self.limit)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=self.limit)
+        self._read_task = asyncio.create_task(self._read_loop())
+        return self
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+            await self._writer.wait_closed()
+        if self._read_task:
+            await asyncio.gather(self._read_task, return_exceptions=True)
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def validate(self, text: str) -> bool:
+        """Return True if text passes the server's Engine guards."""
+        return await self._request({"text": text})
+
+    async def check(self, tool_name: str, input_data: Dict[str, Any]) -> bool:
+        """Return True if the server's tool guard approves the tool call."""
+        return await self._request({"tool": tool_name, "args": input_data})
+
+    async def _request(self, payload: dict) -> bool:
+        if self._read_task is None or self._read_task.done():
+            raise ConnectionError("Guard client is not connected")
+        request_id = next(self._ids)
+        line = (json.dumps({"id": request_id, **payload}) + "\n").encode()
+        if len(line) - 1 > self.limit:
+            raise ValueError(f"Request of {len(line) - 1} bytes exceeds the {self.limit}-byte limit")
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(line)
+        await self._writer.drain()
+        return await future
+
+    async def _read_loop(self):
+        try:
+            while True:
+                try:
+                    line = await read_line(self._reader)
+                except LineTooLong:
+                    continue
+                if line is None:
+                    break
+                response = json.loads(line)
+                request_id = response.get("id")
+                if request_id is None and "error" in response and self._waiting:
+                    # The server could not tell which request failed; our requests are
+                    # well-formed, so blame the oldest one still waiting
+                    request_id = next(iter(self._waiting))
+                future = self._waiting.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response["verdict"])
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Guard server connection closed"))
+            self._waiting.clear()
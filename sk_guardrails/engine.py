@@ -5,3 +5,22 @@ class Engine:
     def run(self, text):
         # All guards must pass
         return all(guard.validate(text) for guard in self.guards)
+
+    def run_batch(self, texts):
+        """Run every guard over a batch of texts, returning one verdict per text."""
+        results = [True] * len(texts)
+        pending = list(range(len(texts)))
+        # Guard-major order: each guard sees the whole batch at once and
+        # texts that already failed are not handed to later guards.
+        for guard in self.guards:
+            if not pending:
+                break
+            verdicts = guard.validate_batch([texts[i] for i in pending])
+            still_pending = []
+            for i, ok in zip(pending, verdicts):
+                if ok:
+                    still_pending.append(i)
+                else:
+                    results[i] = False
+            pending = still_pending
+        return results
@@ -1,3 +1,4 @@
 from .regex import RegexGuard
+from .result import ResultGuard
 
-__all__ = ['RegexGuard']
\ No newline at end of file
+__all__ = ['RegexGuard', 'ResultGuard']
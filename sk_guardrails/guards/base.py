@@ -2,3 +2,7 @@ class BaseGuard:
     def validate(self, text: str) -> bool:
         """Return True if text passes the guard."""
         raise NotImplementedError
+
+    def validate_batch(self, texts: list) -> list:
+        """Return one validate() verdict per text. Override for a faster batch path."""
+        return [self.validate(text) for text in texts]
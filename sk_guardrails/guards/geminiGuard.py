@@ -1,8 +1,10 @@
 # guards/geminiGuard.py
 
 import asyncio
+import json
 import logging
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from sk_guardrails.guards.utils.tool_inspector import get_mcp_tools
 from google import genai
 
@@ -87,3 +89,93 @@ Respond PASS or FAIL:
             #reason = result.get("reason", "No reason provided")
             #logger.warning(f"❌ Gemini rejected tool call: {tool_name}. Reason: {reason}")
             return False
+
+    async def check_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Check a batch of (tool_name, input_data) calls with a single Gemini request.
+        Identical calls are asked about once and unknown tools fail without a model
+        call. Any call the model gives no verdict for is checked on its own.
+        """
+        keys = [json.dumps([name, args], sort_keys=True, default=str) for name, args in calls]
+        unique = dict(zip(keys, calls))
+        by_key = {}
+        known = {}
+        for key, (name, args) in unique.items():
+            tool_info = next((t for t in self.tool_specs if t["name"] == name), None)
+            if tool_info:
+                known[key] = (name, args, tool_info)
+            else:
+                by_key[key] = False
+
+        if len(known) == 1:
+            key, (name, args, _) = next(iter(known.items()))
+            by_key[key] = await self.check(name, args)
+        elif known:
+            response = await self.client.aio.models.generate_content(
+                model=self.gemini_model,
+                contents=self._batch_prompt(list(known.values()))
+            )
+            parsed = parse_batch_verdicts(response.text, len(known))
+            unanswered = []
+            for (key, (name, args, _)), verdict in zip(known.items(), parsed):
+                if verdict is None:
+                    unanswered.append((key, name, args))
+                else:
+                    by_key[key] = verdict
+            if unanswered:
+                logger.warning(f"Gemini gave no verdict for {len(unanswered)} of {len(known)} calls; "
+                               f"checking them one by one")
+                verdicts = await asyncio.gather(*(self.check(name, args) for _, name, args in unanswered))
+                by_key.update(zip((key for key, _, _ in unanswered), verdicts))
+
+        return [by_key[key] for key in keys]
+
+    def _batch_prompt(self, calls) -> str:
+        listed = "\n".join(
+            f"""Call {number}:
+Tool Name: {name}
+Tool Description: {tool_info['description']}
+Tool Input Schema: {tool_info['input_schema']}
+Proposed Input: {args}
+"""
+            for number, (name, args, tool_info) in enumerate(calls, start=1)
+        )
+        return f"""
+You are StreamKnight's validation AI. Your task is to determine, for each of the
+{len(calls)} proposed tool calls below, whether it is valid based on its definition.
+
+---
+{listed}---
+
+For each call: based on the tool's schema and description, is the proposed input valid
+and appropriate? The input must satisfy the schema's requirements (e.g., types, required
+fields). The values provided should make sense for the tool's intended purpose.
+
+Respond with exactly one line per call and nothing else, in the form:
+<call number>: PASS
+<call number>: FAIL
+"""
+
+
+_VERDICT_LINE = re.compile(r"^\W*(?:call\s*)?(\d+)\W*\s*(PASS|FAIL)\b", re.IGNORECASE | re.MULTILINE)
+
+
+def parse_batch_verdicts(text: str, count: int) -> List[Optional[bool]]:
+    """
+    Parse '<n>: PASS' / '<n>: FAIL' lines into one verdict per call; calls with no
+    line, or with conflicting lines, are None.
+    """
+    verdicts = [None] * count
+    seen = set()
+    for number, verdict in _VERDICT_LINE.findall(text or ""):
+        index = int(number) - 1
+        if not 0 <= index < count:
+            continue
+        value = verdict.upper() == "PASS"
+        if index in seen and verdicts[index] != value:
+            verdicts[index] = None
+            continue
+        if index not in seen:
+            verdicts[index] = value
+            seen.add(index)
+    return verdicts
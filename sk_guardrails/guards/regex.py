@@ -1,9 +1,87 @@
 from .base import BaseGuard
+from .utils.regex_safety import (
+    RegexTimeout, RegexWorker, RegexWorkerError, alarm_available, analyze_pattern, linear_pattern,
+    match_with_alarm,
+)
+import logging
 import re
 
+try:
+    import re2
+except ImportError:  # optional linear-time backend (pip install google-re2)
+    re2 = None
+
+logger = logging.getLogger("regex_guard")
+
+
 class RegexGuard(BaseGuard):
-    def __init__(self, pattern):
-        self.pattern = re.compile(pattern)
+    """
+    safety:  what to do when the pattern is prone to catastrophic backtracking,
+             "warn" (log it), "reject" (raise ValueError) or "off". The check is
+             a heuristic over common shapes (nested or adjacent quantifiers,
+             overlapping alternatives) and can miss others; pair "reject" with
+             a timeout or the re2 backend when patterns are untrusted.
+    backend: "re", "re2" (linear time, needs google-re2) or "auto", which uses
+             re2 when it is installed and gives the same results as re for the
+             pattern (see linear_pattern).
+    timeout: per-call budget in seconds for the re backend, None for no limit.
+    fail_open: verdict returned when the budget runs out or the match worker
+             dies; failing closed by default.
+    """
+
+    def __init__(self, pattern, safety="warn", backend="re", timeout=None, fail_open=False):
+        if safety not in ("warn", "reject", "off"):
+            raise ValueError(f"safety must be 'warn', 'reject' or 'off', got {safety!r}")
+        if backend not in ("re", "re2", "auto"):
+            raise ValueError(f"backend must be 're', 're2' or 'auto', got {backend!r}")
+
+        self.findings = analyze_pattern(pattern) if safety != "off" else []
+        if self.findings:
+            message = f"Regex {pattern!r} is prone to catastrophic backtracking: {'; '.join(self.findings)}"
+            if safety == "reject":
+                raise ValueError(message)
+            logger.warning(message)
+
+        if backend == "re2" and re2 is None:
+            raise ValueError("backend 're2' requires the google-re2 package")
+        translated = linear_pattern(pattern) if backend != "re" else None
+        if backend == "re2" and translated is None:
+            raise ValueError(f"Regex {pattern!r} uses constructs the re2 backend does not match like re")
+
+        self.backend = "re"
+        if translated is not None and re2 is not None:
+            options = re2.Options()
+            options.log_errors = False
+            try:
+                self.pattern = re2.compile(translated, options)
+                self.backend = "re2"
+            except re2.error:
+                if backend == "re2":
+                    raise
+        if self.backend == "re":
+            self.pattern = re.compile(pattern)
+
+        self.timeout = timeout
+        self.fail_open = fail_open
+        self._worker = None
 
     def validate(self, text):
-        return bool(self.pattern.match(text))
+        if not isinstance(text, str):
+            raise TypeError(f"RegexGuard expects str, got {type(text).__name__}")
+        # re2 runs in linear time, so only the backtracking engine needs a budget
+        if self.timeout is None or self.backend == "re2":
+            return bool(self.pattern.match(text))
+        try:
+            if alarm_available():
+                return bool(match_with_alarm(self.pattern, text, self.timeout))
+            if self._worker is None:
+                self._worker = RegexWorker(self.pattern.pattern)
+            return self._worker.match(text, self.timeout)
+        except RegexTimeout:
+            logger.warning(f"Regex {self.pattern.pattern!r} exceeded {self.timeout}s on a "
+                           f"{len(text)}-char input, failing {'open' if self.fail_open else 'closed'}")
+            return self.fail_open
+        except RegexWorkerError as e:
+            logger.warning(f"Regex {self.pattern.pattern!r} could not be checked ({e}), "
+                           f"failing {'open' if self.fail_open else 'closed'}")
+            return self.fail_open
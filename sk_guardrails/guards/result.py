@@ -0,0 +1,206 @@
+from .base import BaseGuard
+
+
+class ResultGuard(BaseGuard):
+    """
+    Applies an Engine's guards to tool output as a chunked, streaming scan.
+
+    The source is either a str or any iterable of str pieces (e.g. a streamed
+    tool result). It is checked `chunk_size` characters at a time, plus a
+    small window of `overlap` characters either side of each boundary, so a
+    match of up to `overlap` characters that straddles two chunks is still
+    seen. At most `max_chars` characters are read.
+
+    on_fail decides what happens to a chunk that fails the engine:
+        "reject"   - stop at once, no text is returned
+        "truncate" - stop at once, keep the text that passed before it
+        "redact"   - replace the failing chunk with `redaction` and carry on
+    When the boundary window fails, the end of the previous chunk is cut or
+    redacted together with the chunk, so no prefix of the match is left behind.
+
+    Output is only assembled when it differs from the input: a str source is
+    tracked by offsets and sliced only when truncating or redacting. For an
+    iterable, (piece, start, stop) spans of the source's own pieces are kept
+    and joined once at the end; the chunk strings built for checking are
+    dropped as soon as they pass.
+    """
+
+    ACTIONS = ("reject", "truncate", "redact")
+
+    def __init__(self, engine, chunk_size: int = 4096, overlap: int = 256,
+                 max_chars: int = 65536, on_fail: str = "reject",
+                 redaction: str = "[REDACTED]", truncation: str = "\n[TRUNCATED]"):
+        if on_fail not in self.ACTIONS:
+            raise ValueError(f"on_fail must be one of {self.ACTIONS}, got {on_fail!r}")
+        if chunk_size <= 0 or overlap < 0 or max_chars <= 0:
+            raise ValueError("chunk_size and max_chars must be positive, overlap non-negative")
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.max_chars = max_chars
+        self.on_fail = on_fail
+        self.redaction = redaction
+        self.truncation = truncation
+
+    def validate(self, text: str) -> bool:
+        return self.scan(text)["verdict"] == "pass"
+
+    def scan(self, source) -> dict:
+        """
+        Scan a tool result and return {"verdict", "text", "reason"}.
+
+        verdict is "pass", "fail" (rejected, text is None), "truncated" or
+        "redacted". A str source that passes is returned as the same object.
+        """
+        if isinstance(source, str):
+            return self._scan_text(source)
+        return self._scan_pieces(source)
+
+    def _check(self, chunk, boundary):
+        """Return (chunk passes, boundary window passes)."""
+        return self.engine.run(chunk), boundary is None or self.engine.run(boundary)
+
+    def _scan_text(self, text):
+        end = min(len(text), self.max_chars)
+        redacted = []  # (start, stop) ranges of text replaced by the redaction marker
+        previous = None  # start of the previous chunk, if it passed
+
+        for start in range(0, end, self.chunk_size):
+            stop = min(start + self.chunk_size, end)
+            boundary = None
+            if previous is not None and self.overlap:
+                boundary = text[max(start - self.overlap, previous):min(start + self.overlap, stop)]
+            chunk_ok, boundary_ok = self._check(text[start:stop], boundary)
+            if chunk_ok and boundary_ok:
+                previous = start
+                continue
+
+            cut = start if boundary_ok else max(start - self.overlap, previous)
+            where = f"chars {start}-{stop}"
+            if self.on_fail == "reject":
+                return {"verdict": "fail", "text": None, "reason": f"Tool result rejected at {where}"}
+            if self.on_fail == "truncate":
+                return {"verdict": "truncated", "text": self._assemble(text, redacted, cut, self.truncation),
+                        "reason": f"Tool result truncated at {where}"}
+            redacted.append((cut, stop))
+            previous = None
+
+        if end < len(text):
+            return {"verdict": "truncated", "text": self._assemble(text, redacted, end, self.truncation),
+                    "reason": f"Tool result exceeds {self.max_chars} chars"}
+        if redacted:
+            return {"verdict": "redacted", "text": self._assemble(text, redacted, end),
+                    "reason": "Tool result partially redacted"}
+        return {"verdict": "pass", "text": text, "reason": None}
+
+    def _assemble(self, text, redacted, cut, suffix=""):
+        pieces = []
+        position = 0
+        for start, stop in redacted:
+            pieces.append(text[position:start])
+            pieces.append(self.redaction)
+            position = stop
+        pieces.append(text[position:cut])
+        pieces.append(suffix)
+        return "".join(pieces)
+
+    def _scan_pieces(self, source):
+        kept = []  # (piece, start, stop) spans of the source, and redaction markers
+        previous = None  # the previous chunk, if it passed
+        read = 0
+        redacted = False
+
+        for chunk, spans in self._chunks(source):
+            if chunk is None:
+                return {"verdict": "truncated", "text": _join(kept, self.truncation),
+                        "reason": f"Tool result exceeds {self.max_chars} chars"}
+            boundary = None
+            if previous is not None and self.overlap:
+                boundary = previous[-self.overlap:] + chunk[:self.overlap]
+            chunk_ok, boundary_ok = self._check(chunk, boundary)
+            if chunk_ok and boundary_ok:
+                for span in spans:
+                    _keep(kept, span)
+                previous = chunk
+                read += len(chunk)
+                continue
+
+            if not boundary_ok:
+                # The match starts in the previous chunk; drop its tail as well
+                _drop_tail(kept, min(self.overlap, len(previous)))
+            where = f"chars {read}-{read + len(chunk)}"
+            if self.on_fail == "reject":
+                return {"verdict": "fail", "text": None, "reason": f"Tool result rejected at {where}"}
+            if self.on_fail == "truncate":
+                return {"verdict": "truncated", "text": _join(kept, self.truncation),
+                        "reason": f"Tool result truncated at {where}"}
+            kept.append((self.redaction, 0, len(self.redaction)))
+            redacted = True
+            previous = None
+            read += len(chunk)
+
+        if redacted:
+            return {"verdict": "redacted", "text": _join(kept), "reason": "Tool result partially redacted"}
+        return {"verdict": "pass", "text": _join(kept), "reason": None}
+
+    def _chunks(self, source):
+        """
+        Re-cut an iterable of str pieces into (chunk, spans) pairs, where chunk
+        is the chunk_size text to check and spans are the (piece, start, stop)
+        ranges it was built from. Reading stops at max_chars; if the source had
+        more to give, (None, None) is yielded last.
+        """
+        spans = []
+        size = 0
+        total = 0
+        for piece in source:
+            offset = 0
+            while offset < len(piece):
+                if total == self.max_chars:
+                    if spans:
+                        yield _text(spans), spans
+                    yield None, None
+                    return
+                take = min(self.chunk_size - size, self.max_chars - total, len(piece) - offset)
+                spans.append((piece, offset, offset + take))
+                offset += take
+                size += take
+                total += take
+                if size == self.chunk_size:
+                    yield _text(spans), spans
+                    spans, size = [], 0
+        if spans:
+            yield _text(spans), spans
+
+
+def _slice(span):
+    piece, start, stop = span
+    return piece if start == 0 and stop == len(piece) else piece[start:stop]
+
+
+def _text(spans):
+    return _slice(spans[0]) if len(spans) == 1 else "".join(map(_slice, spans))
+
+
+def _join(kept, suffix=""):
+    if not suffix and len(kept) == 1:
+        return _slice(kept[0])
+    return "".join([_slice(span) for span in kept] + [suffix])
+
+
+def _keep(kept, span):
+    """Append a span, merging it with the previous one when it continues the same piece."""
+    if kept and kept[-1][0] is span[0] and kept[-1][2] == span[1]:
+        kept[-1] = (span[0], kept[-1][1], span[2])
+    else:
+        kept.append(span)
+
+
+def _drop_tail(kept, count):
+    """Remove the last count characters from the spans at the end of kept."""
+    while count and kept:
+        piece, start, stop = kept.pop()
+        if stop - start > count:
+            kept.append((piece, start, stop - count))
+            return
+        count -= stop - start
@@ -0,0 +1,349 @@
+# guards/utils/regex_safety.py
+"""
+Helpers that keep RegexGuard from pinning a core on hostile patterns or inputs:
+a static analyzer for backtracking-prone patterns, a check for the subset a
+linear-time engine (RE2) can run, and per-call time budgets for the re engine.
+"""
+import multiprocessing
+import re
+import signal
+import threading
+import time
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+MAXREPEAT = sre_constants.MAXREPEAT
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+_POSSESSIVE = getattr(sre_constants, "POSSESSIVE_REPEAT", None)
+_ATOMIC = getattr(sre_constants, "ATOMIC_GROUP", None)
+# Constructs RE2 has no linear-time implementation for
+_NOT_LINEAR = {sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS,
+               sre_constants.ASSERT, sre_constants.ASSERT_NOT} | {op for op in (_POSSESSIVE, _ATOMIC) if op}
+
+# Anchors RE2 lacks or matches differently, and flags it cannot honour
+_NOT_LINEAR_AT = {sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY, sre_constants.AT_END_STRING}
+_UNSUPPORTED_FLAGS = re.ASCII | re.LOCALE | re.VERBOSE | re.DEBUG
+_TRAILING_DOLLAR = re.compile(r"(?<!\\)(?:\\\\)*\$\Z")
+
+_SINGLE_CHAR = {sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN}
+
+# First-character sets are computed over Latin-1, which is enough to tell
+# whether two branches can start on the same character.
+_ALPHABET = frozenset(range(256))
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: frozenset(c for c in _ALPHABET if chr(c).isdigit()),
+    sre_constants.CATEGORY_WORD: frozenset(c for c in _ALPHABET if chr(c).isalnum() or c == ord("_")),
+    sre_constants.CATEGORY_SPACE: frozenset(c for c in _ALPHABET if chr(c).isspace()),
+}
+_CATEGORIES[sre_constants.CATEGORY_NOT_DIGIT] = _ALPHABET - _CATEGORIES[sre_constants.CATEGORY_DIGIT]
+_CATEGORIES[sre_constants.CATEGORY_NOT_WORD] = _ALPHABET - _CATEGORIES[sre_constants.CATEGORY_WORD]
+_CATEGORIES[sre_constants.CATEGORY_NOT_SPACE] = _ALPHABET - _CATEGORIES[sre_constants.CATEGORY_SPACE]
+
+
+class RegexTimeout(Exception):
+    """Raised when a match exceeds its time budget."""
+
+
+class RegexWorkerError(Exception):
+    """Raised when the worker process dies or its pipe breaks mid-match."""
+
+
+def analyze_pattern(pattern: str) -> list:
+    """
+    Return human-readable findings for constructs prone to catastrophic
+    backtracking; an empty list means none were found.
+    """
+    findings = []
+    _walk(sre_parse.parse(pattern), findings, follow=None)
+    return list(dict.fromkeys(findings))
+
+
+def is_linear_safe(pattern: str) -> bool:
+    """Return True if a linear-time engine (RE2) gives the same results as re for the pattern."""
+    return linear_pattern(pattern) is not None
+
+
+def linear_pattern(pattern: str):
+    """
+    Return the pattern rewritten for RE2 with the same results as re, or None
+    when that is not possible. Beyond backreferences and lookarounds, this
+    rules out constructs whose meaning differs between the engines: \w, \d,
+    \s and \b (Unicode-aware in re, ASCII in RE2), \Z (not valid in RE2), a
+    non-multiline $ other than at the very end of the pattern (re also
+    matches it before a final newline), and the ASCII, LOCALE and VERBOSE flags.
+    A trailing $ becomes \n?\z.
+    """
+    parsed = sre_parse.parse(pattern)
+    flags = parsed.state.flags
+    if flags & _UNSUPPORTED_FLAGS:
+        return None
+    items = list(parsed)
+    if items and items[-1] == (sre_constants.AT, sre_constants.AT_END) and not flags & re.MULTILINE \
+            and _TRAILING_DOLLAR.search(pattern):
+        items.pop()
+        pattern = pattern[:-1] + r"\n?\z"
+    return pattern if _linear_safe(items, flags) else None
+
+
+def _linear_safe(subpattern, flags) -> bool:
+    for op, av in subpattern:
+        if op in _NOT_LINEAR:
+            return False
+        if op == sre_constants.IN and any(item_op == sre_constants.CATEGORY for item_op, _ in av):
+            return False
+        if op == sre_constants.AT and (av in _NOT_LINEAR_AT or (av == sre_constants.AT_END
+                                                                  and not flags & re.MULTILINE)):
+            return False
+        if op == sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, body = av
+            if add_flags & _UNSUPPORTED_FLAGS:
+                return False
+            if not _linear_safe(body, (flags | add_flags) & ~del_flags):
+                return False
+        elif not all(_linear_safe(child, flags) for child in _children(op, av)):
+            return False
+    return True
+
+
+def _children(op, av):
+    if op in _REPEATS or op == _POSSESSIVE:
+        return [av[2]]
+    if op == sre_constants.SUBPATTERN:
+        return [av[-1]]
+    if op == sre_constants.BRANCH:
+        return av[1]
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [av[1]]
+    if op == sre_constants.GROUPREF_EXISTS:
+        return [p for p in av[1:] if p is not None]
+    if op == _ATOMIC:
+        return [av]
+    return []
+
+
+def _is_repeat(op, av) -> bool:
+    """
+    A backtracking repeat: one that can match a variable number of times, or
+    a fixed number (> 1) of a variable-width body, as in (.*a){12}.
+    """
+    if op not in _REPEATS or av[1] <= 1:
+        return False
+    low, high = av[2].getwidth()
+    return av[0] != av[1] or low != high
+
+
+def _single_char(subpattern) -> bool:
+    return len(subpattern) == 1 and subpattern[0][0] in _SINGLE_CHAR
+
+
+def _walk(subpattern, findings, follow):
+    """
+    follow is the set of characters that may come right after subpattern
+    while still inside an enclosing repeat, or None outside of any repeat.
+    A repeat whose body can start with one of those characters can split the
+    same input across iterations in many ways.
+    """
+    items = list(subpattern)
+    for index, (op, av) in enumerate(items):
+        if op == _POSSESSIVE or op == _ATOMIC:
+            # Possessive and atomic constructs never backtrack into themselves
+            continue
+        rest_chars, rest_nullable = _first(items[index + 1:])
+        after = None if follow is None else (rest_chars | follow if rest_nullable else rest_chars)
+
+        if not _is_repeat(op, av):
+            for child in _children(op, av):
+                _walk(child, findings, after)
+            continue
+
+        body = av[2]
+        body_chars = _first(body)[0]
+        if after is not None and body_chars & after:
+            findings.append("nested quantifier: a repeated group contains an ambiguous quantifier")
+        alternatives = _overlapping_branch(body)
+        if alternatives:
+            findings.append(f"quantified alternation with overlapping branches {alternatives}")
+        if body.getwidth()[0] == 0 and body_chars & rest_chars:
+            # (a?){22}a{22}: every iteration may or may not take the character
+            findings.append("repeated optional body followed by overlapping characters")
+        if index + 1 < len(items) and av[1] == MAXREPEAT and _single_char(body):
+            next_op, next_av = items[index + 1]
+            if _is_repeat(next_op, next_av) and next_av[1] == MAXREPEAT and _single_char(next_av[2]) \
+                    and body_chars & _first(next_av[2])[0]:
+                findings.append("adjacent unbounded quantifiers over overlapping characters")
+        _walk(body, findings, body_chars | (after or set()))
+
+
+def _overlapping_branch(body, body_first=None):
+    """
+    Return the indexes of two alternatives in a repeated body that can match
+    alike, if any. An empty alternative counts when another one can start the
+    same way as the body itself (sre_parse turns "a|aa" into "a(?:|a)"), and
+    two empty alternatives are identical branches ("a|a" becomes "a(?:|)").
+    """
+    if body_first is None:
+        body_first = _first(body)[0]
+    for op, av in body:
+        if op == sre_constants.SUBPATTERN:
+            found = _overlapping_branch(av[-1], body_first)
+            if found:
+                return found
+        elif op == sre_constants.BRANCH:
+            firsts = [_first(branch) for branch in av[1]]
+            for i in range(len(firsts)):
+                for j in range(i + 1, len(firsts)):
+                    (chars_i, empty_i), (chars_j, empty_j) = firsts[i], firsts[j]
+                    if chars_i & chars_j or (empty_i and empty_j) or (empty_i and chars_j & body_first) \
+                            or (empty_j and chars_i & body_first):
+                        return (i, j)
+    return None
+
+
+def _first(subpattern):
+    """Return (characters the subpattern can start with, whether it can match empty)."""
+    chars = set()
+    for op, av in subpattern:
+        item_chars, nullable = _first_item(op, av)
+        chars |= item_chars
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+def _first_item(op, av):
+    if op == sre_constants.LITERAL:
+        return {av}, False
+    if op == sre_constants.NOT_LITERAL:
+        return set(_ALPHABET - {av}), False
+    if op == sre_constants.ANY:
+        return set(_ALPHABET), False
+    if op == sre_constants.IN:
+        return _class_chars(av), False
+    if op in _REPEATS or op == _POSSESSIVE:
+        chars, nullable = _first(av[2])
+        return chars, nullable or av[0] == 0
+    if op == sre_constants.SUBPATTERN:
+        return _first(av[-1])
+    if op == _ATOMIC:
+        return _first(av)
+    if op == sre_constants.BRANCH:
+        chars, nullable = set(), False
+        for branch in av[1]:
+            branch_chars, branch_nullable = _first(branch)
+            chars |= branch_chars
+            nullable = nullable or branch_nullable
+        return chars, nullable
+    if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+        return set(_ALPHABET), True
+    # Anchors and lookarounds consume nothing
+    return set(), True
+
+
+def _class_chars(items):
+    chars = set()
+    negate = False
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            chars.add(av)
+        elif op == sre_constants.RANGE:
+            chars.update(range(av[0], min(av[1], 255) + 1))
+        elif op == sre_constants.CATEGORY:
+            chars |= _CATEGORIES.get(av, _ALPHABET)
+    return set(_ALPHABET - chars) if negate else chars
+
+
+def match_with_alarm(compiled, text: str, timeout: float):
+    """
+    Run compiled.match under a SIGALRM timer. The re engine checks for
+    signals while backtracking, so this interrupts it in place. Only usable
+    from the main thread, see alarm_available().
+    """
+    def _expired(signum, frame):
+        raise RegexTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    start = time.monotonic()
+    previous_timer = signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return compiled.match(text)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if previous_timer[0] > 0:
+            # Someone armed a timer in between; give back what is left of it
+            remaining = max(previous_timer[0] - (time.monotonic() - start), 1e-6)
+            signal.setitimer(signal.ITIMER_REAL, remaining, previous_timer[1])
+
+
+def alarm_available() -> bool:
+    """True on the main thread when no ITIMER_REAL of the host application is running."""
+    return hasattr(signal, "setitimer") \
+        and threading.current_thread() is threading.main_thread() \
+        and signal.getitimer(signal.ITIMER_REAL)[0] == 0
+
+
+def _worker_loop(conn, pattern):
+    compiled = re.compile(pattern)
+    while True:
+        try:
+            text = conn.recv()
+        except EOFError:
+            return
+        conn.send(bool(compiled.match(text)))
+
+
+class RegexWorker:
+    """
+    Matches in a child process so a runaway match can be killed from any
+    thread. The process is started lazily and replaced after a timeout.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+
+    def match(self, text: str, timeout: float) -> bool:
+        with self._lock:
+            if self._process is None:
+                self._start()
+            try:
+                self._conn.send(text)
+                if self._conn.poll(timeout):
+                    return self._conn.recv()
+            except (EOFError, OSError) as e:
+                self._stop()
+                raise RegexWorkerError(f"Regex worker died: {e!r}") from e
+            self._stop()
+            raise RegexTimeout()
+
+    @property
+    def pid(self):
+        """Process id of the running worker, or None before the first match."""
+        return self._process.pid if self._process is not None else None
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+    def _start(self):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_worker_loop, args=(child, self.pattern), daemon=True)
+        self._process.start()
+        child.close()
+
+    def _stop(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = None
+        self._conn = None
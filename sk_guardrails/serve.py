@@ -0,0 +1,322 @@
+# sk_guardrails/serve.py
+"""
+Standalone guard service, so agent processes can share one Engine and one
+GeminiGuard (tool catalog, client and verdict cache) instead of embedding their own.
+
+    python -m sk_guardrails.serve --pattern "^[a-zA-Z ]+$" --port 8765
+    python -m sk_guardrails.serve --mcp-url http://localhost:5000/mcp --unix /tmp/sk.sock
+
+The protocol is newline-delimited JSON. Each request carries an id that is
+echoed back, so a client may pipeline many requests on one connection:
+
+    {"id": 1, "text": "Hello"}                     -> Engine check
+    {"id": 2, "tool": "add", "args": {"a": 1}}     -> GeminiGuard check
+    {"id": 1, "verdict": true}
+    {"id": 3, "error": "..."}
+
+Requests arriving within `window` seconds of each other are micro-batched into
+a single Engine.run_batch call and a single GeminiGuard.check_batch call. Text
+and tool requests are batched separately, so Engine checks never queue behind
+an LLM round-trip. A request line over `limit` bytes gets an error response
+carrying the request's id when it can be read from the start of the line, or
+a null id otherwise.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+
+from sk_guardrails.engine import Engine
+from sk_guardrails.guards.regex import RegexGuard
+
+logger = logging.getLogger("guard_server")
+
+
+DEFAULT_LIMIT = 16 * 1024 * 1024  # largest request line, in bytes
+
+
+class MicroBatcher:
+    def __init__(self, engine: Engine, tool_guard=None, window: float = 0.002,
+                 max_batch: int = 256, cache_size: int = 4096):
+        self.engine = engine
+        self.tool_guard = tool_guard
+        self.window = window
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        # Separate queues so cheap Engine checks never wait on an LLM round-trip
+        self._text_queue = asyncio.Queue()
+        self._tool_queue = asyncio.Queue()
+        self._tool_cache = OrderedDict()
+        self._tasks = set()
+
+    def start(self):
+        self._spawn(self._run(self._text_queue, self._run_texts, detach=False))
+        self._spawn(self._run(self._tool_queue, self._run_tools, detach=True))
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Fail whatever never made it into a batch
+        for queue in (self._text_queue, self._tool_queue):
+            while not queue.empty():
+                _resolve([queue.get_nowait()], [RuntimeError("Guard server is shutting down")])
+
+    async def submit(self, request: dict) -> bool:
+        """Queue a request and wait for its verdict."""
+        future = asyncio.get_running_loop().create_future()
+        queue = self._tool_queue if "tool" in request else self._text_queue
+        await queue.put((request, future))
+        return await future
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _collect(self, queue):
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Anything already queued rides along without waiting further
+        while len(batch) < self.max_batch and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def _run(self, queue, handler, detach):
+        while True:
+            batch = await self._collect(queue)
+            if detach:
+                # Tool batches overlap, so one slow LLM call doesn't hold up the next batch
+                self._spawn(self._guarded(handler, batch))
+            else:
+                await self._guarded(handler, batch)
+
+    async def _guarded(self, handler, batch):
+        try:
+            await handler(batch)
+        except asyncio.CancelledError:
+            _resolve(batch, [RuntimeError("Guard server is shutting down")] * len(batch))
+            raise
+        except Exception as e:
+            logger.exception("Guard batch failed")
+            _resolve(batch, [e] * len(batch))
+
+    async def _run_texts(self, items):
+        verdicts = self.engine.run_batch([str(req.get("text", "")) for req, _ in items])
+        _resolve(items, verdicts)
+
+    async def _run_tools(self, items):
+        if self.tool_guard is None:
+            _resolve(items, [RuntimeError("No tool guard configured")] * len(items))
+            return
+
+        keys = [json.dumps([req["tool"], req.get("args", {})], sort_keys=True, default=str)
+                for req, _ in items]
+        found = {}
+        misses = {}
+        for key, (req, _) in zip(keys, items):
+            if key in self._tool_cache:
+                self._tool_cache.move_to_end(key)
+                found[key] = self._tool_cache[key]
+            elif key not in misses:
+                misses[key] = (req["tool"], req.get("args", {}))
+        if misses:
+            verdicts = await self.tool_guard.check_batch(list(misses.values()))
+            found.update(zip(misses, verdicts))
+            for key in misses:
+                self._cache_put(key, found[key])
+        _resolve(items, [found[key] for key in keys])
+
+    def _cache_put(self, key, verdict):
+        self._tool_cache[key] = verdict
+        self._tool_cache.move_to_end(key)
+        while len(self._tool_cache) > self.cache_size:
+            self._tool_cache.popitem(last=False)
+
+
+def _resolve(items, verdicts):
+    for (_, future), verdict in zip(items, verdicts):
+        if future.done():
+            continue
+        if isinstance(verdict, Exception):
+            future.set_exception(verdict)
+        else:
+            future.set_result(verdict)
+
+
+class LineTooLong(Exception):
+    """Raised after an over-limit request line has been read and discarded."""
+
+    def __init__(self, head: bytes = b""):
+        super().__init__()
+        self.head = head  # first bytes of the line, enough to recover the request id
+
+
+_ID_PREFIX = re.compile(rb'\s*\{\s*"id"\s*:\s*(-?\d+|"[^"\\]*")')
+
+
+def _recover_id(head: bytes):
+    """Return the id of a request whose line starts with {"id": ..., else None."""
+    found = _ID_PREFIX.match(head)
+    return json.loads(found.group(1)) if found else None
+
+
+async def read_line(reader):
+    """
+    Return the next newline-terminated line, or None at end of stream. A line
+    longer than the reader's limit is drained and LineTooLong raised, so the
+    connection stays usable.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+    head = b""
+    while True:
+        data = await reader.readexactly(consumed)
+        head = head or data[:64]
+        try:
+            await reader.readuntil(b"\n")
+            raise LineTooLong(head)
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+class GuardServer:
+    def __init__(self, batcher: MicroBatcher, limit: int = DEFAULT_LIMIT):
+        self.batcher = batcher
+        self.limit = limit
+        self._server = None
+        self._connections = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str = None):
+        self.batcher.start()
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path, limit=self.limit)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=self.limit)
+        logger.info(f"Guard server listening on {unix_path or self.address}")
+        return self
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self.batcher.stop()
+        # Since Python 3.12 wait_closed() waits for open connections, so end them first
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        write_lock = asyncio.Lock()
+        pending = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    line = await read_line(reader)
+                except LineTooLong as e:
+                    await self._send(writer, write_lock, {"id": _recover_id(e.head),
+                                                          "error": f"Request exceeds {self.limit} bytes"})
+                    continue
+                if line is None:
+                    break
+                task = asyncio.create_task(self._answer(line, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(connection)
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, line, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = {"id": request_id, "verdict": await self.batcher.submit(request)}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        await self._send(writer, write_lock, response)
+
+    async def _send(self, writer, write_lock, response):
+        async with write_lock:
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+
+
+async def main(args):
+    timeout = args.regex_timeout / 1000.0 if args.regex_timeout else None
+    engine = Engine([RegexGuard(pattern, safety=args.regex_safety, backend=args.regex_backend,
+                                timeout=timeout, fail_open=args.regex_fail_open)
+                     for pattern in args.pattern])
+
+    tool_guard = None
+    if args.mcp_url:
+        from sk_guardrails.guards.geminiGuard import GeminiGuard
+        tool_guard = GeminiGuard(args.mcp_url, gemini_model=args.gemini_model,
+                                 api_key=os.getenv("GEMINI_API_KEY"))
+        await tool_guard.initialize()
+
+    batcher = MicroBatcher(engine, tool_guard, window=args.window / 1000.0,
+                           max_batch=args.max_batch)
+    server = await GuardServer(batcher, limit=args.limit).start(args.host, args.port, args.unix)
+    await server.serve_forever()
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="StreamKnight guard service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on a unix socket path instead of TCP")
+    parser.add_argument("--pattern", action="append", default=[],
+                        help="RegexGuard pattern for the Engine (repeatable)")
+    parser.add_argument("--regex-safety", choices=["warn", "reject", "off"], default="warn")
+    parser.add_argument("--regex-backend", choices=["re", "re2", "auto"], default="re")
+    parser.add_argument("--regex-timeout", type=float, help="Per-call regex budget in ms")
+    parser.add_argument("--regex-fail-open", action="store_true",
+                        help="Pass texts whose regex check runs out of budget")
+    parser.add_argument("--mcp-url", help="MCP server URL; enables GeminiGuard tool checks")
+    parser.add_argument("--gemini-model", default="gemini-2.5-flash")
+    parser.add_argument("--window", type=float, default=2.0, help="Micro-batch window in ms")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Largest request line in bytes")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args))
+
+
+if __name__ == "__main__":
+    cli()
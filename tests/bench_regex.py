@@ -0,0 +1,56 @@
+"""
+Worst-case RegexGuard latency on adversarial inputs, unbounded vs. budgeted vs. re2.
+python tests/bench_regex.py --budget 50
+"""
+
+from pathlib import Path
+import sys
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import logging
+import time
+
+from sk_guardrails.guards.regex import RegexGuard, re2
+
+logging.disable(logging.WARNING)
+
+# (pattern, largest n still run without a budget; beyond it the run takes minutes)
+ADVERSARIAL = [
+    (r"^(a+)+$", 24),
+    (r"^(a|aa)*$", 24),
+    (r"^([a-z]+ ?)*$", 20),
+]
+
+
+def timed(guard, text):
+    start = time.perf_counter()
+    guard.validate(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(args):
+    budget = args.budget / 1000.0
+    for pattern, unbounded_max in ADVERSARIAL:
+        unbounded = RegexGuard(pattern, safety="off")
+        budgeted = RegexGuard(pattern, safety="off", timeout=budget)
+        linear = RegexGuard(pattern, safety="off", backend="re2") if re2 else None
+        print(f"\n{pattern}")
+        print(f"{'n':>4} {'re (ms)':>12} {'re+budget':>12} {'re2 (ms)':>12}")
+        for n in range(args.start, args.stop + 1, args.step):
+            text = "a" * n + "!"
+            plain = timed(unbounded, text) if n <= unbounded_max else float("nan")
+            capped = timed(budgeted, text)
+            fast = timed(linear, text) if linear else float("nan")
+            print(f"{n:>4} {plain:>12.2f} {capped:>12.2f} {fast:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=50.0, help="Per-call budget in ms")
+    parser.add_argument("--start", type=int, default=16)
+    parser.add_argument("--stop", type=int, default=40)
+    parser.add_argument("--step", type=int, default=4)
+    main(parser.parse_args())
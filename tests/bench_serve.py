@@ -0,0 +1,88 @@
+"""
+Localhost throughput/latency benchmark for the guard service.
+python tests/bench_serve.py --clients 32 --requests 500
+"""
+
+from pathlib import Path
+import sys
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import time
+
+from sk_guardrails.client import GuardClient
+from sk_guardrails.engine import Engine
+from sk_guardrails.guards.regex import RegexGuard
+from sk_guardrails.serve import GuardServer, MicroBatcher
+
+
+class SlowToolGuard:
+    """Stands in for GeminiGuard: one fixed round-trip per batch."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.batches = 0
+
+    async def check_batch(self, calls):
+        self.batches += 1
+        await asyncio.sleep(self.latency)
+        return [name != "rm" for name, _ in calls]
+
+
+async def run_clients(port, clients, requests, make_call):
+    latencies = []
+
+    async def worker(n):
+        async with GuardClient(port=port) as client:
+            for i in range(requests):
+                start = time.perf_counter()
+                await make_call(client, n, i)
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return elapsed, latencies
+
+
+def report(label, total, elapsed, latencies):
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{label:<8} {total / elapsed:>10.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+async def main(args):
+    tool_guard = SlowToolGuard(args.llm_latency / 1000.0)
+    batcher = MicroBatcher(Engine([RegexGuard(r"^[a-zA-Z ]+$")]), tool_guard,
+                           window=args.window / 1000.0)
+    server = await GuardServer(batcher).start(port=0)
+    port = server.address[1]
+
+    async def text_call(client, n, i):
+        assert await client.validate("Hello StreamKnight") is True
+
+    async def tool_call(client, n, i):
+        assert await client.check("add", {"a": n, "b": i % 8}) is True
+
+    total = args.clients * args.requests
+    report("engine", total, *await run_clients(port, args.clients, args.requests, text_call))
+
+    tool_requests = max(1, args.requests // 10)
+    elapsed, latencies = await run_clients(port, args.clients, tool_requests, tool_call)
+    report("tool", args.clients * tool_requests, elapsed, latencies)
+    print(f"tool guard batches: {tool_guard.batches} for {args.clients * tool_requests} calls")
+
+    await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--window", type=float, default=2.0, help="Micro-batch window in ms")
+    parser.add_argument("--llm-latency", type=float, default=50.0, help="Simulated LLM latency in ms")
+    asyncio.run(main(parser.parse_args()))
@@ -25,6 +25,9 @@ from mcp.client.streamable_http import streamablehttp_client
 from openai import OpenAI
 
 from sk_guardrails.guards.geminiGuard import GeminiGuard  # <-- added
+from sk_guardrails.engine import Engine
+from sk_guardrails.guards.regex import RegexGuard
+from sk_guardrails.guards.result import ResultGuard
 
 load_dotenv()  # load environment variables from .env
 
@@ -37,13 +40,15 @@ logger = logging.getLogger("client")
 
 
 class MCPClient:
-    def __init__(self, gemini_guard: Optional[GeminiGuard] = None):
+    def __init__(self, gemini_guard: Optional[GeminiGuard] = None,
+                 result_guard: Optional[ResultGuard] = None):
         # Initialize session and client objects
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
         self.openai = OpenAI()
         self.messages = []  # Store conversation history
         self.guard = gemini_guard  # Optional GeminiGuard
+        self.result_guard = result_guard  # Optional ResultGuard for tool output
 
     async def process_query(self, query: str) -> str:
         """Process a query using OpenAI and available tools"""
@@ -87,7 +92,18 @@ class MCPClient:
                 # Execute tool call
                 result = await self.session.call_tool(tool_name, tool_args)
                 final_text.append(f"[Calling tool {tool_name} with args {tool_args}]")
-                final_text.append(f"[Tool call result: {result.content[0].text}]")
+                tool_output = result.content[0].text
+
+                # ResultGuard check before the output reaches the model
+                if self.result_guard:
+                    scan = self.result_guard.scan(tool_output)
+                    if scan["verdict"] == "fail":
+                        final_text.append(f"❌ Tool result rejected by ResultGuard: {scan['reason']}")
+                        tool_output = f"[Tool result withheld: {scan['reason']}]"
+                    else:
+                        tool_output = scan["text"]
+
+                final_text.append(f"[Tool call result: {tool_output}]")
 
                 # Add assistant message with tool call to history
                 self.messages.append({
@@ -106,7 +122,7 @@ class MCPClient:
                 self.messages.append({
                     "role": "tool",
                     "tool_call_id": tool_call.id,
-                    "content": str(result.content[0].text)
+                    "content": tool_output
                 })
 
                 # Get next assistant response
@@ -159,7 +175,13 @@ async def run_session(read_stream, write_stream):
     await gemini_guard.initialize()
     logger.info("✅ GeminiGuard initialized.")
 
-    client = MCPClient(gemini_guard=gemini_guard)
+    # Initialize ResultGuard: redact credentials from tool output before the model sees it
+    result_guard = ResultGuard(
+        Engine([RegexGuard(r"^(?![\s\S]*(?:sk-[A-Za-z0-9]{16}|AKIA[0-9A-Z]{16}))")]),
+        on_fail="redact",
+    )
+
+    client = MCPClient(gemini_guard=gemini_guard, result_guard=result_guard)
     async with ClientSession(read_stream, write_stream) as session:
         client.session = session
         logger.info("Initializing session")
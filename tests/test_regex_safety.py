@@ -0,0 +1,98 @@
+import logging
+import os
+import signal
+import threading
+import time
+
+from sk_guardrails.guards.regex import RegexGuard, re2
+from sk_guardrails.guards.utils.regex_safety import analyze_pattern, is_linear_safe
+
+logging.disable(logging.WARNING)
+
+# Static analysis flags backtracking-prone patterns and leaves ordinary ones alone
+for pattern, risky in [
+    (r"^[a-zA-Z ]+$", False),
+    (r"^(\d+\.)+\d+$", False),
+    (r"^(a+)+$", True),
+    (r"^(a|aa)*$", True),
+    (r"^(a|a)*$", True),
+    (r"^(ab|ab)*$", True),
+    (r"^(a?){22}a{22}$", True),
+    (r"^(\w+\s?)*$", True),
+    (r"\d+\d+$", True),
+    (r"^(.*a){12}$", True),
+    (r"(?:a+){5}", True),
+    (r"^(\d{3}-){2}\d{4}$", False),
+]:
+    findings = analyze_pattern(pattern)
+    print(f"{pattern:<18} -> {findings or 'safe'}")
+    assert bool(findings) == risky
+
+try:
+    RegexGuard(r"^(a+)+$", safety="reject")
+    raise AssertionError("risky pattern was accepted")
+except ValueError as e:
+    print(f"rejected: {e}")
+
+# A time budget bounds the worst case; the verdict on timeout is configurable
+evil = "a" * 40 + "!"
+for fail_open in (False, True):
+    guard = RegexGuard(r"^(a+)+$", timeout=0.05, fail_open=fail_open)
+    start = time.perf_counter()
+    verdict = guard.validate(evil)
+    elapsed = time.perf_counter() - start
+    print(f"fail_open={fail_open} -> {verdict} in {elapsed * 1000:.1f} ms")
+    assert verdict is fail_open and elapsed < 0.5
+    assert guard.validate("aaaa") is True
+
+# A timer the host application has running is left alone; the budget moves to the worker
+signal.signal(signal.SIGALRM, lambda *args: None)
+signal.setitimer(signal.ITIMER_REAL, 30)
+guard = RegexGuard(r"^(a+)+$", timeout=0.05)
+assert guard.validate(evil) is False
+remaining = signal.getitimer(signal.ITIMER_REAL)[0]
+signal.setitimer(signal.ITIMER_REAL, 0)
+print(f"host timer after budgeted match: {remaining:.2f}s left")
+assert 29 < remaining <= 30
+
+# A worker killed mid-session maps to the fail-open/closed verdict and is replaced
+guard = RegexGuard(r"^a+$", timeout=0.5)
+out = {}
+
+
+def off_main_thread():
+    out["started"] = guard.validate("aaa")
+    os.kill(guard._worker.pid, signal.SIGKILL)
+    time.sleep(0.1)
+    out["dead"] = guard.validate("aaa")
+    out["after"] = guard.validate("aaa")
+
+
+thread = threading.Thread(target=off_main_thread)
+thread.start()
+thread.join()
+print(f"killed worker -> {out}")
+assert out == {"started": True, "dead": False, "after": True}
+
+# Input is type-checked before any backend sees it
+try:
+    guard.validate(123)
+    raise AssertionError("non-str input was matched")
+except TypeError as e:
+    print(f"non-str -> {e}")
+
+# Linear-time backend, when google-re2 is installed
+if re2:
+    guard = RegexGuard(r"^(a+)+$", backend="auto")
+    assert guard.backend == "re2" and guard.validate(evil) is False
+    assert RegexGuard(r"(a)\1", backend="auto").backend == "re"
+    # auto only picks re2 when the verdicts agree with re
+    for pattern, text in [(r"^\w+$", "café"), (r"^\d+$", "\u0661\u0662"), (r"^\s$", "\xa0"),
+                          (r"^[a-z]+$", "abc\n"), (r"^[a-z]+$", "abc\n\n"), (r"(?m)^[a-z]+$", "abc\nd")]:
+        guard = RegexGuard(pattern, backend="auto")
+        assert guard.validate(text) is RegexGuard(pattern).validate(text), (pattern, text, guard.backend)
+    assert RegexGuard(r"^[a-z]+$", backend="auto").backend == "re2"
+    print("re2 backend ok")
+
+assert not is_linear_safe(r"^a\Z") and not is_linear_safe(r"\bword") and not is_linear_safe(r"(?a)\w")
+assert is_linear_safe(r"^[a-z]+$") and not is_linear_safe(r"a$|b")
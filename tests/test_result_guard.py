@@ -0,0 +1,66 @@
+from sk_guardrails.guards.regex import RegexGuard
+from sk_guardrails.guards.result import ResultGuard
+from sk_guardrails.engine import Engine
+
+# Tool output must not contain an API key anywhere in a chunk
+engine = Engine([RegexGuard(r"^(?![\s\S]*sk-[A-Za-z0-9]{16})")])
+
+clean = "ok " * 100_000
+leaky = "ok " * 10_000 + "sk-ABCDEFGHIJKLMNOP" + "ok " * 10_000
+
+for action in ResultGuard.ACTIONS:
+    guard = ResultGuard(engine, chunk_size=4096, max_chars=1_000_000, on_fail=action)
+    result = guard.scan(leaky)
+    print(f"{action:<8} leaky -> {result['verdict']} ({result['reason']})")
+    assert result["text"] is None or "sk-ABCDEFGHIJKLMNOP" not in result["text"]
+
+guard = ResultGuard(engine, max_chars=1_000_000)
+result = guard.scan(clean)
+assert result["verdict"] == "pass" and result["text"] is clean
+print("clean    -> pass, returned without a copy")
+
+# Key split across the boundary of streamed pieces is still caught via the overlap
+pieces = ["ok " * 1365 + "sk-ABCDEFGH", "IJKLMNOP" + "ok " * 100]
+result = ResultGuard(engine, chunk_size=4096).scan(iter(pieces))
+print(f"split    -> {result['verdict']}")
+assert result["verdict"] == "fail"
+
+# A key straddling a chunk boundary leaves none of itself behind
+straddle = "ok " * 1364 + "x" + "sk-ABCDEFGHIJKLMNOP" + "ok " * 2000
+for action in ("truncate", "redact"):
+    result = ResultGuard(engine, chunk_size=4096, on_fail=action).scan(straddle)
+    print(f"{action:<8} straddle -> {result['verdict']}")
+    assert "sk-" not in result["text"], result["text"][-40:]
+
+# Redacting one chunk does not spill into the clean chunk after it
+tail_key = "ok " * 1359 + "sk-ABCDEFGHIJKLMNOP"
+assert len(tail_key) == 4096
+result = ResultGuard(engine, chunk_size=4096, on_fail="redact").scan(tail_key + "b" * 4096)
+assert result["text"].count("[REDACTED]") == 1 and result["text"].endswith("b" * 4096)
+print("redact   -> next chunk kept")
+
+# Oversized results are cut at max_chars without being read further
+result = ResultGuard(engine, max_chars=8192).scan(iter(["ok " * 1000] * 1000))
+print(f"oversize -> {result['verdict']} ({result['reason']}), {len(result['text'])} chars")
+assert result["verdict"] == "truncated"
+
+# Scanning a large clean result allocates about one chunk, not a second copy of the input
+import tracemalloc
+
+big = "ok " * 1_000_000
+guard = ResultGuard(engine, max_chars=len(big))
+tracemalloc.start()
+result = guard.scan(big)
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+print(f"3 MB scan -> {result['verdict']}, peak {peak / 1024:.0f} KiB above the input")
+assert result["text"] is big and peak < 64 * 1024
+
+# Streamed pieces are kept as-is and joined once: about one extra copy at most
+pieces = ["ok " * 1000] * 1000
+tracemalloc.start()
+result = ResultGuard(engine, max_chars=10 ** 7).scan(iter(pieces))
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+print(f"3 MB stream -> {result['verdict']}, peak {peak / 1024 / 1024:.2f} MiB")
+assert result["text"] == "".join(pieces) and peak < 3.5 * 1024 * 1024
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+import time
+
+from sk_guardrails.client import GuardClient
+from sk_guardrails.engine import Engine
+from sk_guardrails.guards.base import BaseGuard
+from sk_guardrails.guards.regex import RegexGuard
+from sk_guardrails.serve import GuardServer, MicroBatcher
+
+try:
+    from sk_guardrails.guards.geminiGuard import GeminiGuard
+except ImportError:  # google-genai / mcp not installed
+    GeminiGuard = None
+
+logging.disable(logging.CRITICAL)
+
+
+class CountingGuard(BaseGuard):
+    def __init__(self, pattern):
+        self.inner = RegexGuard(pattern)
+        self.seen = []
+
+    def validate(self, text):
+        self.seen.append(text)
+        return self.inner.validate(text)
+
+
+class StubToolGuard:
+    """Stands in for GeminiGuard; "slow*" tools take a second, "boom" raises."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def check_batch(self, calls):
+        self.calls.extend(name for name, _ in calls)
+        if any(name == "boom" for name, _ in calls):
+            raise RuntimeError("tool guard exploded")
+        if any(name.startswith("slow") for name, _ in calls):
+            await asyncio.sleep(1.0)
+        return [name != "rm" for name, _ in calls]
+
+
+# Engine.run_batch runs guard by guard and drops texts once they fail
+letters, short = CountingGuard(r"^[a-z]+$"), CountingGuard(r"^.{1,5}$")
+verdicts = Engine([letters, short]).run_batch(["abc", "ab1", "abcdefg", "xyz"])
+print(f"run_batch -> {verdicts}")
+assert verdicts == [True, False, False, True]
+assert letters.seen == ["abc", "ab1", "abcdefg", "xyz"]
+assert short.seen == ["abc", "abcdefg", "xyz"]
+
+# GeminiGuard.check_batch sends one prompt per batch and asks about each distinct call once
+if GeminiGuard:
+    from types import SimpleNamespace
+    from sk_guardrails.guards.geminiGuard import parse_batch_verdicts
+
+    prompts = []
+
+    async def generate_content(model, contents):
+        prompts.append(contents)
+        if "Call 2:" in contents:
+            return SimpleNamespace(text="1: PASS\n2: FAIL")  # says nothing about call 3
+        return SimpleNamespace(text="PASS")
+
+    gemini = GeminiGuard("http://localhost:5000/mcp")
+    gemini.tool_specs = [{"name": name, "description": name, "input_schema": {}}
+                         for name in ("add", "rm", "ls")]
+    gemini.client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+    result = asyncio.run(gemini.check_batch(
+        [("add", {"a": 1}), ("rm", {}), ("add", {"a": 1}), ("nope", {}), ("ls", {})]))
+    print(f"check_batch -> {result} in {len(prompts)} prompts")
+    assert result == [True, False, True, False, True]
+    # One batched prompt, plus a single follow-up for the call the model skipped
+    assert len(prompts) == 2 and "Call 3:" in prompts[0] and "nope" not in prompts[0]
+    assert parse_batch_verdicts("Call 1: PASS\n**2** - fail\n1: FAIL\n9: PASS", 2) == [None, False]
+else:
+    print("check_batch skipped (google-genai not installed)")
+
+
+async def raw_request(port, payload: bytes):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(payload)
+    await writer.drain()
+    lines = [json.loads(await reader.readline()) for _ in range(payload.count(b"\n"))]
+    writer.close()
+    return lines
+
+
+async def main():
+    tool_guard = StubToolGuard()
+    batcher = MicroBatcher(Engine([RegexGuard(r"^[a-zA-Z ]+$")]), tool_guard,
+                           window=0.05, cache_size=2)
+    server = await GuardServer(batcher, limit=1024).start(port=0)
+    port = server.address[1]
+
+    async with GuardClient(port=port, limit=1024) as client:
+        assert await client.validate("Hello StreamKnight") is True
+        assert await client.validate("Hello123") is False
+
+        # Cache hits skip the tool guard and count as recent use
+        assert await client.check("a", {}) is True
+        assert await client.check("b", {}) is True
+        assert await client.check("a", {}) is True
+        assert tool_guard.calls == ["a", "b"]
+
+        # With a full cache, one batch holding a cached key and a miss must not lose the hit
+        assert await asyncio.gather(client.check("a", {}), client.check("c", {})) == [True, True]
+        await client.check("a", {})
+        assert tool_guard.calls == ["a", "b", "c"], tool_guard.calls
+        await client.check("b", {})
+        assert tool_guard.calls == ["a", "b", "c", "b"], "b should have been evicted, not a"
+        print("tool verdict cache ok")
+
+        # A failing tool batch surfaces as an error and the batcher keeps going
+        try:
+            await client.check("boom", {})
+            raise AssertionError("error was swallowed")
+        except RuntimeError as e:
+            print(f"tool error -> {e}")
+        assert await client.check("rm", {}) is False
+
+        # Engine checks do not wait for a slow tool batch
+        slow = asyncio.create_task(client.check("slow", {}))
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+        assert await client.validate("quick") is True
+        waited = time.perf_counter() - start
+        print(f"text check behind slow tool batch: {waited * 1000:.1f} ms")
+        assert waited < 0.5
+        assert await slow is True
+
+        # Oversized requests fail on the client without reaching the server
+        try:
+            await client.validate("x" * 2048)
+            raise AssertionError("oversized request was sent")
+        except ValueError as e:
+            print(f"client limit -> {e}")
+
+    # A client with a larger limit than the server gets the error for that request
+    async with GuardClient(port=port, limit=1 << 20) as client:
+        try:
+            await client.validate("x" * 2048)
+            raise AssertionError("oversized request was accepted")
+        except RuntimeError as e:
+            print(f"server limit -> {e}")
+        assert await client.validate("still fine") is True
+
+    # Bad JSON and oversized lines get error responses; the connection stays open.
+    # Responses may arrive in any order.
+    responses = await raw_request(
+        port, b"not json\n" + b"x" * 4096 + b"\n" + b'{"id": 7, "text": "fine"}\n')
+    assert {"id": 7, "verdict": True} in responses
+    errors = [r for r in responses if r["id"] is None]
+    big = next(r for r in errors if "exceeds" in r["error"])
+    bad = next(r for r in errors if r is not big)
+    print(f"bad input -> {bad['error']!r}, {big['error']!r}")
+
+    # An error the server cannot tie to a request fails the oldest one instead of hanging it
+    async def anonymous_errors(reader, writer):
+        while await reader.readline():
+            writer.write(b'{"id": null, "error": "cannot tell"}\n')
+        writer.close()
+
+    stub = await asyncio.start_server(anonymous_errors, "127.0.0.1", 0)
+    async with GuardClient(port=stub.sockets[0].getsockname()[1]) as client:
+        try:
+            await asyncio.wait_for(client.validate("hello"), 2)
+            raise AssertionError("anonymous error was ignored")
+        except RuntimeError as e:
+            print(f"null-id error -> {e}")
+    stub.close()
+
+    # Closing the server with a client still connected neither hangs nor leaves requests waiting;
+    # requests on a closed client fail fast
+    client = await GuardClient(port=port).connect()
+    slow = asyncio.create_task(client.check("slow-again", {}))
+    await asyncio.sleep(0.1)
+    await asyncio.wait_for(server.close(), 5)
+    await client.close()
+    try:
+        await slow
+        raise AssertionError("pending request survived the close")
+    except (ConnectionError, RuntimeError):
+        pass
+    try:
+        await client.validate("late")
+        raise AssertionError("closed client accepted a request")
+    except ConnectionError:
+        print("client close handling ok")
+
+
+asyncio.run(main())